@@ -0,0 +1,93 @@
+"""Compare the memory of the old dict audit entries with DecisionRecord.
+
+Run from the repository root (requires homeassistant):
+
+    python benchmarks/decision_memory.py [decisions] [evaluations]
+"""
+import os
+import sys
+import tracemalloc
+import uuid
+from collections import deque
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.ha_governance.decision import DecisionRecord
+
+
+def _old_layout(count, policies, candidates, snapshot_hash, context_ids):
+    log = deque(maxlen=count)
+    for i in range(count):
+        log.append(
+            {
+                "timestamp": dt_util.utcnow().isoformat(),
+                "event_type": "state_changed",
+                "entity_id": "sensor.power",
+                "policy_snapshot_hash": snapshot_hash,
+                "evaluations": tuple(
+                    {
+                        "name": str(policies[index]["name"]),
+                        "priority": int(policies[index]["priority"]),
+                        "matched": position % 3 == 0,
+                        "cooldown_blocked": False,
+                    }
+                    for position, index in enumerate(candidates)
+                ),
+                "final_policy": str(policies[candidates[0]]["name"]),
+                "enforcement_result": "success",
+                "context_id": context_ids[i],
+            }
+        )
+    return log
+
+
+def _new_layout(count, policies, candidates, snapshot_hash, context_ids):
+    matched = sum(1 << position for position in range(len(candidates)) if position % 3 == 0)
+    log = deque(maxlen=count)
+    for i in range(count):
+        log.append(
+            DecisionRecord(
+                dt_util.utcnow().timestamp(),
+                "state_changed",
+                "sensor.power",
+                snapshot_hash,
+                policies,
+                candidates,
+                matched,
+                0,
+                str(policies[candidates[0]]["name"]),
+                "success",
+                context_ids[i],
+            )
+        )
+    return log
+
+
+def _measure(build, *args):
+    tracemalloc.start()
+    log = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, log
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    evaluations = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    policies = tuple({"name": f"policy_{i}", "priority": i} for i in range(2 * evaluations))
+    candidates = tuple(range(0, 2 * evaluations, 2))
+    snapshot_hash = uuid.uuid4().hex * 2
+    context_ids = [uuid.uuid4().hex[:26].upper() for _ in range(count)]
+    args = (count, policies, candidates, snapshot_hash, context_ids)
+    old_bytes, old_log = _measure(_old_layout, *args)
+    new_bytes, new_log = _measure(_new_layout, *args)
+    assert new_log[0].evaluations == old_log[0]["evaluations"]
+    print(f"{count} decisions x {evaluations} evaluations")
+    print(f"  dict layout:    {old_bytes / 1024:8.0f} KiB")
+    print(f"  DecisionRecord: {new_bytes / 1024:8.0f} KiB  ({old_bytes / new_bytes:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
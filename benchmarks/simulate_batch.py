@@ -0,0 +1,51 @@
+"""Time PolicyNetwork.simulate() over a large batch of hypothetical snapshots.
+
+Run from the repository root (requires homeassistant):
+
+    python benchmarks/simulate_batch.py [snapshots] [policies]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from custom_components.ha_governance.policy_engine import _sort_policies
+from custom_components.ha_governance.policy_network import PolicyNetwork
+
+ENTITIES = [f"sensor.s{i}" for i in range(6)] + ["input_boolean.a", "input_select.house_mode"]
+VALUES = ["on", "off", "home", "away", "1", "5", "22.5", "abc"]
+
+
+def _random_policies(rng, count):
+    policies = []
+    for i in range(count):
+        when = {}
+        for _ in range(rng.randint(0, 4)):
+            path = rng.choice(ENTITIES) + (".attr" if rng.random() < 0.3 else "")
+            if rng.random() < 0.5:
+                when[path] = rng.choice([">=", ">", "<", "<=", "==", "!="]) + rng.choice(["1", "5", "10", "22", "on"])
+            else:
+                when[path] = rng.choice(["on", "off", "home", "5", 5, True])
+        policies.append({"name": f"p{i}", "priority": rng.randint(0, 5), "when": when})
+    return _sort_policies(policies)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    policy_count = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    rng = random.Random(0)
+    network = PolicyNetwork(_random_policies(rng, policy_count))
+    snapshots = [{entity_id: rng.choice(VALUES) for entity_id in ENTITIES} for _ in range(count)]
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        network.simulate(snapshots)
+        timings.append(time.perf_counter() - start)
+    print(f"{count} snapshots x {policy_count} policies")
+    print(f"  best {min(timings):.3f}s  median {sorted(timings)[len(timings) // 2]:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
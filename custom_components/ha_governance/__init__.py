@@ -4,7 +4,8 @@ import json
 import hashlib
 from collections import deque
 from typing import Any, Dict, Optional
-from homeassistant.core import HomeAssistant
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_STATE_CHANGED
 from homeassistant.helpers.dispatcher import async_dispatcher_send
@@ -13,18 +14,34 @@ from .const import (
     DOMAIN,
     CONF_POLICY_PATH,
     CONF_COOLDOWN_SECONDS,
+    CONF_PRUNE_DEAD_POLICIES,
     DEFAULT_POLICY_PATH,
     DEFAULT_COOLDOWN_SECONDS,
+    DEFAULT_PRUNE_DEAD_POLICIES,
     DISPATCHER_POLICIES_UPDATED,
     DISPATCHER_POLICY_EXECUTED,
     DISPATCHER_DECISION_UPDATED,
+    DISPATCHER_THRESHOLD_STATS_UPDATED,
+    AUDIT_LOG_MAXLEN,
 )
-from .policy_engine import load_policies, evaluate, ensure_policy_file_exists, build_entity_index
+from .policy_engine import (
+    load_policies,
+    ensure_policy_file_exists,
+    build_entity_index,
+    build_threshold_index,
+)
+from .policy_network import PolicyNetwork, ThresholdFilter, build_policy_network, async_simulate
+from .policy_analysis import analyze_policies
+from .decision import DecisionRecord
 from .enforcement import apply as apply_enforcement, is_self_caused, setup_periodic_cleanup
 from .config_flow import OptionsFlowHandler
 
 _LOGGER = logging.getLogger(__name__)
 _EVENT_LOCK = asyncio.Lock()
+SIMULATE_SCHEMA = vol.Schema({
+    vol.Required("snapshots"): [dict],
+    vol.Optional("inherit_live_state", default=True): bool,
+})
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
@@ -33,11 +50,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     data["options"] = {
         CONF_POLICY_PATH: entry.options.get(CONF_POLICY_PATH, DEFAULT_POLICY_PATH),
         CONF_COOLDOWN_SECONDS: entry.options.get(CONF_COOLDOWN_SECONDS, DEFAULT_COOLDOWN_SECONDS),
+        CONF_PRUNE_DEAD_POLICIES: entry.options.get(CONF_PRUNE_DEAD_POLICIES, DEFAULT_PRUNE_DEAD_POLICIES),
     }
     data.setdefault("reload_lock", asyncio.Lock())
     data.setdefault("policy_stats", {})
+    data.setdefault("threshold_stats", {})
     data.setdefault("policy_snapshot_hash", "")
-    data.setdefault("audit_log", deque(maxlen=1000))
+    data.setdefault("audit_log", deque(maxlen=AUDIT_LOG_MAXLEN))
     data["last_decision"] = None
     await hass.async_add_executor_job(
         ensure_policy_file_exists,
@@ -49,6 +68,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
     _setup_daily_stats_reset(hass)
     async def _on_started(event) -> None:
+        network = hass.data[DOMAIN].get("policy_network")
+        if network is not None:
+            network.sync(hass)
         await _register_listeners(hass)
         _LOGGER.info("[ha_governance] Event listeners registered after HA startup")
         _validate_policies(hass)
@@ -57,6 +79,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await _reload_policies(hass)
         _validate_policies(hass)
     hass.services.async_register(DOMAIN, "reload_policies", _handle_reload_service)
+    async def _handle_simulate_service(call: ServiceCall) -> ServiceResponse:
+        results = await async_simulate(hass, call.data["snapshots"], call.data["inherit_live_state"])
+        return {"results": results}
+    hass.services.async_register(
+        DOMAIN,
+        "simulate",
+        _handle_simulate_service,
+        schema=SIMULATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
@@ -73,8 +105,26 @@ async def _reload_policies(hass: HomeAssistant) -> None:
         policies = await load_policies(hass, path)
         data["policies"] = tuple(policies)
         entity_index = build_entity_index(list(policies))
+        analysis, dead = analyze_policies(data["policies"], entity_index)
+        active = data["policies"]
+        analysis["excluded"] = []
+        if dead and options.get(CONF_PRUNE_DEAD_POLICIES, DEFAULT_PRUNE_DEAD_POLICIES):
+            active = tuple(p for index, p in enumerate(active) if index not in dead)
+            entity_index = build_entity_index(list(active))
+            analysis["excluded"] = list(analysis["dead"])
+        data["policy_analysis"] = analysis
         data["entity_index"] = entity_index
         data["relevant_entities"] = frozenset(entity_index.keys())
+        data["policy_network"] = build_policy_network(hass, active, entity_index)
+        # Simulation reports every matching policy, so it always sees the unpruned set.
+        data["simulation_network"] = (
+            data["policy_network"] if active is data["policies"] else PolicyNetwork(data["policies"])
+        )
+        threshold_index = build_threshold_index(list(active))
+        data["threshold_filter"] = ThresholdFilter(threshold_index, entity_index)
+        threshold_stats = data.setdefault("threshold_stats", {})
+        for entity_id in [e for e in threshold_stats if e not in threshold_index]:
+            del threshold_stats[entity_id]
         try:
             snapshot_hash = hashlib.sha256(
                 json.dumps(policies, sort_keys=True, separators=(",", ":")).encode("utf-8")
@@ -88,6 +138,7 @@ async def _reload_policies(hass: HomeAssistant) -> None:
             if entry.title != new_title:
                 hass.config_entries.async_update_entry(entry, title=new_title)
         async_dispatcher_send(hass, DISPATCHER_POLICIES_UPDATED)
+        async_dispatcher_send(hass, DISPATCHER_THRESHOLD_STATS_UPDATED)
 
 
 def _validate_policies(hass: HomeAssistant) -> None:
@@ -110,6 +161,17 @@ def _validate_policies(hass: HomeAssistant) -> None:
                 domain, svc_name = svc.split(".", 1)
                 if not hass.services.has_service(domain, svc_name):
                     _LOGGER.warning(f"[ha_governance] Policy '{name}': Service '{svc}' not found")
+    analysis = data.get("policy_analysis", {})
+    for item in analysis.get("contradictory", []):
+        _LOGGER.warning(f"[ha_governance] Policy '{item['policy']}' can never match: {item['reason']}")
+    for item in analysis.get("shadowed", []):
+        _LOGGER.warning(f"[ha_governance] Policy '{item['policy']}' can never win: shadowed by higher-priority policy '{item['shadowed_by']}'")
+    for item in analysis.get("overlapping_targets", []):
+        first, second = item["policies"]
+        _LOGGER.info(f"[ha_governance] Policies '{first}' and '{second}' can match together on {', '.join(item['targets'])}; '{first}' wins by priority")
+    excluded = analysis.get("excluded", [])
+    if excluded:
+        _LOGGER.info(f"[ha_governance] Excluded {len(excluded)} dead policies from evaluation: {', '.join(excluded)}")
 
 
 def _setup_daily_stats_reset(hass: HomeAssistant) -> None:
@@ -125,6 +187,16 @@ def _setup_daily_stats_reset(hass: HomeAssistant) -> None:
     async_track_time_change(hass, _reset_daily_stats, hour=0, minute=0, second=0)
 
 async def _register_listeners(hass: HomeAssistant) -> None:
+    @callback
+    def _track_state(event) -> None:
+        # Runs synchronously for every state change (including self-caused ones) so the
+        # policy network always mirrors hass.states before _handle_event evaluates it.
+        network = hass.data[DOMAIN].get("policy_network")
+        if network is None:
+            return
+        entity_id = event.data.get("entity_id")
+        if entity_id:
+            network.update(entity_id, event.data.get("new_state"))
     async def _handle_event(event) -> None:
         try:
             async with _EVENT_LOCK:
@@ -144,18 +216,22 @@ async def _register_listeners(hass: HomeAssistant) -> None:
                 relevant = hass.data[DOMAIN].get("relevant_entities")
                 if entity_id and relevant and entity_id not in relevant:
                     return
-                selected_policies = list(policies)
-                if entity_id:
-                    try:
-                        entity_index = hass.data[DOMAIN].get("entity_index", {})
-                        names = entity_index.get(entity_id, set())
-                        if names:
-                            selected_policies = [p for p in policies if p.get("name") in names]
-                        else:
-                            return
-                    except Exception:
-                        selected_policies = list(policies)
-                winner, evaluations = evaluate(hass, selected_policies)
+                network = hass.data[DOMAIN].get("policy_network")
+                if network is None:
+                    return
+                winner_position, candidates, matched = network.match(entity_id or None)
+                threshold_filter = hass.data[DOMAIN].get("threshold_filter")
+                if threshold_filter is not None and threshold_filter.tracks(entity_id):
+                    counters = hass.data[DOMAIN].setdefault("threshold_stats", {}).setdefault(
+                        entity_id, {"evaluated": 0, "skipped": 0}
+                    )
+                    winner_index = candidates[winner_position] if winner_position is not None else None
+                    if threshold_filter.should_skip(entity_id, winner_index, event.data.get("old_state"), event.data.get("new_state")):
+                        counters["skipped"] += 1
+                        return
+                    counters["evaluated"] += 1
+                winner = network.policies[candidates[winner_position]] if winner_position is not None else None
+                cooldown_blocked = 0
                 result = None
                 if winner:
                     result = await apply_enforcement(
@@ -165,11 +241,9 @@ async def _register_listeners(hass: HomeAssistant) -> None:
                         getattr(event, "context", None),
                     )
                     if result == "skipped_cooldown":
-                        name = str(winner.get("name", ""))
-                        for e in evaluations:
-                            if e.get("name") == name and e.get("matched"):
-                                e["cooldown_blocked"] = True
-                                break
+                        cooldown_blocked = 1 << winner_position
+                if threshold_filter is not None:
+                    threshold_filter.record(network, candidates, matched, winner_position, result)
                 if winner is None and result is None:
                     return
                 data = hass.data[DOMAIN]
@@ -187,23 +261,26 @@ async def _register_listeners(hass: HomeAssistant) -> None:
                 final_policy_name = str(winner.get("name", "")) if winner else None
                 if last_decision is not None:
                     if (
-                        last_decision.get("final_policy") == final_policy_name
-                        and last_decision.get("enforcement_result") == result
-                        and last_decision.get("event_type") == event.event_type
-                        and last_decision.get("entity_id") == entity_id
-                        and last_decision.get("policy_snapshot_hash") == snapshot_hash
+                        last_decision.final_policy == final_policy_name
+                        and last_decision.enforcement_result == result
+                        and last_decision.event_type == event.event_type
+                        and last_decision.entity_id == entity_id
+                        and last_decision.policy_snapshot_hash == snapshot_hash
                     ):
                         return
-                decision = {
-                    "timestamp": dt_util.utcnow().isoformat(),
-                    "event_type": event.event_type,
-                    "entity_id": entity_id,
-                    "policy_snapshot_hash": snapshot_hash,
-                    "evaluations": tuple(evaluations),
-                    "final_policy": final_policy_name,
-                    "enforcement_result": result,
-                    "context_id": context_id,
-                }
+                decision = DecisionRecord(
+                    dt_util.utcnow().timestamp(),
+                    event.event_type,
+                    entity_id,
+                    snapshot_hash,
+                    network.policies,
+                    candidates,
+                    matched,
+                    cooldown_blocked,
+                    final_policy_name,
+                    result,
+                    context_id,
+                )
                 audit_log = data.get("audit_log")
                 if audit_log is not None:
                     audit_log.append(decision)
@@ -211,6 +288,7 @@ async def _register_listeners(hass: HomeAssistant) -> None:
                 async_dispatcher_send(hass, DISPATCHER_DECISION_UPDATED)
         except Exception as e:
             _LOGGER.error(f"[ha_governance] Error in event handler: {e}", exc_info=True)
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _track_state)
     hass.bus.async_listen(EVENT_STATE_CHANGED, _handle_event)
 
 def async_get_options_flow(config_entry: ConfigEntry):
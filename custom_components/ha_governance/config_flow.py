@@ -2,7 +2,16 @@ from typing import Any, Dict
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN, CONF_COOLDOWN_SECONDS, CONF_MODE_ENTITY, CONF_POLICY_PATH, DEFAULT_COOLDOWN_SECONDS, DEFAULT_POLICY_PATH
+from .const import (
+    DOMAIN,
+    CONF_COOLDOWN_SECONDS,
+    CONF_MODE_ENTITY,
+    CONF_POLICY_PATH,
+    CONF_PRUNE_DEAD_POLICIES,
+    DEFAULT_COOLDOWN_SECONDS,
+    DEFAULT_POLICY_PATH,
+    DEFAULT_PRUNE_DEAD_POLICIES,
+)
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input: Dict[str, Any] | None = None):
@@ -12,6 +21,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Optional(CONF_COOLDOWN_SECONDS, default=DEFAULT_COOLDOWN_SECONDS): int,
             vol.Optional(CONF_MODE_ENTITY, default=""): str,
             vol.Optional(CONF_POLICY_PATH, default=DEFAULT_POLICY_PATH): str,
+            vol.Optional(CONF_PRUNE_DEAD_POLICIES, default=DEFAULT_PRUNE_DEAD_POLICIES): bool,
         })
         return self.async_show_form(step_id="user", data_schema=schema)
 
@@ -30,5 +40,6 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             vol.Optional(CONF_COOLDOWN_SECONDS, default=data.get(CONF_COOLDOWN_SECONDS, DEFAULT_COOLDOWN_SECONDS)): int,
             vol.Optional(CONF_MODE_ENTITY, default=data.get(CONF_MODE_ENTITY, "")): str,
             vol.Optional(CONF_POLICY_PATH, default=data.get(CONF_POLICY_PATH, DEFAULT_POLICY_PATH)): str,
+            vol.Optional(CONF_PRUNE_DEAD_POLICIES, default=data.get(CONF_PRUNE_DEAD_POLICIES, DEFAULT_PRUNE_DEAD_POLICIES)): bool,
         })
         return self.async_show_form(step_id="init", data_schema=schema)
@@ -3,9 +3,13 @@ DATA_KEY = "data"
 CONF_COOLDOWN_SECONDS = "cooldown_seconds"
 CONF_MODE_ENTITY = "mode_entity"
 CONF_POLICY_PATH = "policy_path"
+CONF_PRUNE_DEAD_POLICIES = "prune_dead_policies"
 DEFAULT_COOLDOWN_SECONDS = 10
+DEFAULT_PRUNE_DEAD_POLICIES = False
 DEFAULT_POLICY_FILENAME = "policies.yaml"
 DEFAULT_POLICY_PATH = f"/config/{DEFAULT_POLICY_FILENAME}"
 DISPATCHER_POLICIES_UPDATED = "ha_governance_policies_updated"
 DISPATCHER_POLICY_EXECUTED = "ha_governance_policy_executed"
 DISPATCHER_DECISION_UPDATED = "ha_governance_decision_updated"
+DISPATCHER_THRESHOLD_STATS_UPDATED = "ha_governance_threshold_stats_updated"
+AUDIT_LOG_MAXLEN = 10000
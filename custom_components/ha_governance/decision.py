@@ -0,0 +1,79 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+from homeassistant.util import dt as dt_util
+
+# Decision records stay in the audit ring buffer, so they are kept compact: evaluated
+# policies are indices into the (shared) policy snapshot tuple, matched/cooldown flags are
+# int bitsets over those positions and the timestamp is a float. Strings such as the
+# snapshot hash or policy names are references to the snapshot's objects, not copies.
+# Dicts are only rendered when a sensor or an export reads the record.
+class DecisionRecord:
+    __slots__ = (
+        "timestamp",
+        "event_type",
+        "entity_id",
+        "policy_snapshot_hash",
+        "policies",
+        "candidates",
+        "matched",
+        "cooldown_blocked",
+        "final_policy",
+        "enforcement_result",
+        "context_id",
+    )
+
+    def __init__(
+        self,
+        timestamp: float,
+        event_type: str,
+        entity_id: Optional[str],
+        policy_snapshot_hash: str,
+        policies: Sequence[Dict[str, Any]],
+        candidates: Sequence[int],
+        matched: int,
+        cooldown_blocked: int,
+        final_policy: Optional[str],
+        enforcement_result: Optional[str],
+        context_id: Optional[str],
+    ) -> None:
+        self.timestamp = timestamp
+        self.event_type = event_type
+        self.entity_id = entity_id
+        self.policy_snapshot_hash = policy_snapshot_hash
+        self.policies = policies
+        self.candidates = candidates
+        self.matched = matched
+        self.cooldown_blocked = cooldown_blocked
+        self.final_policy = final_policy
+        self.enforcement_result = enforcement_result
+        self.context_id = context_id
+
+    @property
+    def iso_timestamp(self) -> str:
+        return dt_util.utc_from_timestamp(self.timestamp).isoformat()
+
+    @property
+    def evaluations(self) -> Tuple[Dict[str, Any], ...]:
+        rendered = []
+        for position, index in enumerate(self.candidates):
+            policy = self.policies[index]
+            rendered.append(
+                {
+                    "name": str(policy.get("name", "")),
+                    "priority": int(policy.get("priority", 0)),
+                    "matched": bool(self.matched >> position & 1),
+                    "cooldown_blocked": bool(self.cooldown_blocked >> position & 1),
+                }
+            )
+        return tuple(rendered)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.iso_timestamp,
+            "event_type": self.event_type,
+            "entity_id": self.entity_id,
+            "policy_snapshot_hash": self.policy_snapshot_hash,
+            "evaluations": self.evaluations,
+            "final_policy": self.final_policy,
+            "enforcement_result": self.enforcement_result,
+            "context_id": self.context_id,
+        }
@@ -0,0 +1,15 @@
+from typing import Any, Dict
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    data = hass.data.get(DOMAIN, {})
+    network = data.get("policy_network")
+    return {
+        "policy_count": len(data.get("policies", ())),
+        "active_policy_count": network.policy_count if network is not None else 0,
+        "policy_snapshot_hash": data.get("policy_snapshot_hash", ""),
+        "policy_analysis": data.get("policy_analysis", {}),
+    }
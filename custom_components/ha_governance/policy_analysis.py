@@ -0,0 +1,163 @@
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from .policy_engine import OPS, _extract_target_entities, _match_value, _parse_expected, _split_entity_path
+
+# (op symbol or None for plain equality, literal as compared, original expected value)
+Condition = Tuple[Optional[str], Any, Any]
+Field = Tuple[str, Optional[str]]
+
+_NEGATED = {">=": "<", ">": "<=", "<": ">=", "<=": ">", "==": "!=", "!=": "=="}
+
+def _compile_conditions(when: Any) -> Optional[Dict[Field, List[Condition]]]:
+    # None means the policy can never match (same outcome as evaluate()).
+    if not isinstance(when, dict):
+        return None
+    fields: Dict[Field, List[Condition]] = {}
+    for entity_path, expected in when.items():
+        split = _split_entity_path(entity_path) if isinstance(entity_path, str) else None
+        if split is None:
+            return None
+        op_symbol, literal = _parse_expected(expected)
+        fields.setdefault(split, []).append((op_symbol, literal if op_symbol else str(literal), expected))
+    return fields
+
+def _interval_feasible(constraints: List[Tuple[str, Any]]) -> bool:
+    lower = upper = equal = None
+    lower_strict = upper_strict = False
+    excluded = set()
+    for op_symbol, bound in constraints:
+        if op_symbol == "==":
+            if equal is not None and equal != bound:
+                return False
+            equal = bound
+        elif op_symbol == "!=":
+            excluded.add(bound)
+        elif op_symbol in (">", ">="):
+            strict = op_symbol == ">"
+            if lower is None or bound > lower or (bound == lower and strict):
+                lower, lower_strict = bound, strict
+        else:
+            strict = op_symbol == "<"
+            if upper is None or bound < upper or (bound == upper and strict):
+                upper, upper_strict = bound, strict
+    if equal is not None:
+        return all(OPS[op_symbol](equal, bound) for op_symbol, bound in constraints)
+    if lower is not None and upper is not None:
+        if lower > upper:
+            return False
+        if lower == upper:
+            return not lower_strict and not upper_strict and lower not in excluded
+    return True
+
+def _feasible(conditions: List[Condition]) -> bool:
+    # Conservative: returns True unless the conditions on one field provably exclude each other.
+    pinned = {literal for op_symbol, literal, _ in conditions if op_symbol is None}
+    if len(pinned) > 1:
+        return False
+    if pinned:
+        value = next(iter(pinned))
+        if value in ("True", "False"):
+            return True
+        return all(_match_value(value, expected) for op_symbol, _, expected in conditions if op_symbol)
+    try:
+        numeric = [(op_symbol, float(literal)) for op_symbol, literal, _ in conditions]
+    except (ValueError, TypeError):
+        return True
+    if not all(math.isfinite(bound) for _, bound in numeric):
+        return True
+    # Numeric values compare as floats, everything else as strings against the same literals.
+    textual = [(op_symbol, str(literal)) for op_symbol, literal, _ in conditions]
+    return _interval_feasible(numeric) or _interval_feasible(textual)
+
+def _implies(fields: Dict[Field, List[Condition]], other: Dict[Field, List[Condition]]) -> bool:
+    # True if every state matching `fields` also matches `other`.
+    for field, other_conditions in other.items():
+        conditions = fields.get(field)
+        if not conditions:
+            return False
+        known = {(op_symbol, literal) for op_symbol, literal, _ in conditions}
+        for op_symbol, literal, _ in other_conditions:
+            if (op_symbol, literal) in known:
+                continue
+            if op_symbol is None:
+                return False
+            negated = _NEGATED[op_symbol]
+            if _feasible(conditions + [(negated, literal, negated + str(literal))]):
+                return False
+    return True
+
+def _compatible(fields: Dict[Field, List[Condition]], other: Dict[Field, List[Condition]]) -> bool:
+    for field, conditions in other.items():
+        if field in fields and not _feasible(fields[field] + conditions):
+            return False
+    return True
+
+def _target_entities(policy: Dict[str, Any]) -> Set[str]:
+    enforce = policy.get("enforce", {})
+    if not isinstance(enforce, dict):
+        return set()
+    targets: Set[str] = set()
+    for entity_id in _extract_target_entities(enforce.get("target")):
+        parts = str(entity_id).split(".")
+        if len(parts) >= 2:
+            targets.add(parts[0] + "." + parts[1])
+    return targets
+
+def analyze_policies(policies: Sequence[Dict[str, Any]], entity_index: Dict[str, Set[str]]) -> Tuple[Dict[str, Any], Set[int]]:
+    # `policies` must be sorted like _sort_policies. Returns the report and the indices of
+    # provably dead policies (never matching, or always beaten by a higher-priority policy).
+    names = [str(p.get("name", "")) for p in policies]
+    duplicated = {name for name, count in Counter(names).items() if count > 1}
+    watched: Dict[str, Set[str]] = {}
+    for entity_id, policy_names in entity_index.items():
+        for name in policy_names:
+            watched.setdefault(name, set()).add(entity_id)
+    compiled = [_compile_conditions(p.get("when", {})) for p in policies]
+    targets = [_target_entities(p) for p in policies]
+    contradictory: List[Dict[str, Any]] = []
+    shadowed: List[Dict[str, Any]] = []
+    overlapping: List[Dict[str, Any]] = []
+    dead: Set[int] = set()
+    for index, fields in enumerate(compiled):
+        if fields is None:
+            contradictory.append({"policy": names[index], "reason": "invalid 'when' (not a mapping or entity path without domain)"})
+            dead.add(index)
+            continue
+        for (entity_id, attr_name), conditions in fields.items():
+            if not _feasible(conditions):
+                path = entity_id if attr_name is None else f"{entity_id}.{attr_name}"
+                contradictory.append({"policy": names[index], "reason": f"conditions on '{path}' exclude each other"})
+                dead.add(index)
+                break
+    for index, fields in enumerate(compiled):
+        if index in dead or names[index] in duplicated:
+            continue
+        for higher in range(index):
+            other = compiled[higher]
+            if higher in dead or other is None or names[higher] in duplicated:
+                continue
+            # A policy is only a candidate for events of the entities it watches, so the
+            # higher one must watch all of them to always be evaluated alongside.
+            if not watched.get(names[index], set()) <= watched.get(names[higher], set()):
+                continue
+            if _implies(fields, other):
+                shadowed.append({"policy": names[index], "shadowed_by": names[higher]})
+                dead.add(index)
+                break
+    for index in range(len(policies)):
+        if index in dead or not targets[index]:
+            continue
+        for lower in range(index + 1, len(policies)):
+            if lower in dead:
+                continue
+            common = targets[index] & targets[lower]
+            if common and _compatible(compiled[index], compiled[lower]):
+                overlapping.append({"policies": [names[index], names[lower]], "targets": sorted(common)})
+    report = {
+        "contradictory": contradictory,
+        "shadowed": shadowed,
+        "overlapping_targets": overlapping,
+        "dead": [names[index] for index in sorted(dead)],
+    }
+    return report, dead
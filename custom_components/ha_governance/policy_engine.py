@@ -1,5 +1,7 @@
 import asyncio
+import bisect
 import logging
+import math
 import os
 import operator
 import hashlib
@@ -32,42 +34,54 @@ def _parse_expected(expected: Any):
             return symbol, expected[len(symbol):]
     return None, expected
 
-def _get_entity_value(hass: HomeAssistant, entity_path: str):
+def _split_entity_path(entity_path: str) -> Optional[Tuple[str, Optional[str]]]:
     if "." not in entity_path:
         return None
     parts = entity_path.split(".")
     entity_id = parts[0] + "." + parts[1]
-    state = hass.states.get(entity_id)
+    if len(parts) > 2:
+        return entity_id, parts[2]
+    return entity_id, None
+
+def _state_value(state: Optional[State], attr_name: Optional[str]):
     if state is None:
         return None
-    if len(parts) > 2:
-        attr_name = parts[2]
+    if attr_name is not None:
         return state.attributes.get(attr_name)
     return state.state
 
+def _get_entity_value(hass: HomeAssistant, entity_path: str):
+    split = _split_entity_path(entity_path)
+    if split is None:
+        return None
+    entity_id, attr_name = split
+    return _state_value(hass.states.get(entity_id), attr_name)
+
+def _match_value(value: Any, expected: Any) -> bool:
+    if value is None:
+        return False
+    op_symbol, compare_value = _parse_expected(expected)
+    if op_symbol:
+        try:
+            op_func = OPS[op_symbol]
+            try:
+                value_num = float(value)
+                compare_num = float(compare_value)
+                return bool(op_func(value_num, compare_num))
+            except (ValueError, TypeError):
+                return bool(op_func(str(value), str(compare_value)))
+        except Exception:
+            return False
+    return str(value) == str(compare_value)
+
 def _match_when(hass: HomeAssistant, when: Dict[str, Any]) -> bool:
     for entity_path, expected in when.items():
         value = _get_entity_value(hass, entity_path)
         if value is None:
             _LOGGER.debug(f"[ha_governance] Entity not found or unavailable: {entity_path}")
             return False
-        op_symbol, compare_value = _parse_expected(expected)
-        if op_symbol:
-            try:
-                op_func = OPS[op_symbol]
-                try:
-                    value_num = float(value)
-                    compare_num = float(compare_value)
-                    if not op_func(value_num, compare_num):
-                        return False
-                except (ValueError, TypeError):
-                    if not op_func(str(value), str(compare_value)):
-                        return False
-            except Exception:
-                return False
-        else:
-            if str(value) != str(compare_value):
-                return False
+        if not _match_value(value, expected):
+            return False
     return True
 
 def _sort_policies(policies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -108,6 +122,75 @@ def build_entity_index(policies: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
                     index.setdefault(normalized, set()).add(name)
     return index
 
+def _threshold_literal(expected: Any) -> Optional[float]:
+    op_symbol, compare_value = _parse_expected(expected)
+    if not op_symbol:
+        return None
+    try:
+        threshold = float(compare_value)
+    except (ValueError, TypeError):
+        return None
+    if not math.isfinite(threshold):
+        return None
+    return threshold
+
+def build_threshold_index(policies: List[Dict[str, Any]]) -> Dict[str, Dict[Optional[str], List[float]]]:
+    # Only entities whose every condition is a numeric OPS comparison and that are never an
+    # enforce target qualify; for them an event that stays between the same two thresholds
+    # cannot change any policy outcome.
+    thresholds: Dict[str, Dict[Optional[str], Set[float]]] = {}
+    excluded: Set[str] = set()
+    for policy in policies:
+        when = policy.get("when", {})
+        if isinstance(when, dict):
+            for entity_path, expected in when.items():
+                split = _split_entity_path(entity_path) if isinstance(entity_path, str) else None
+                if split is None:
+                    continue
+                entity_id, attr_name = split
+                threshold = _threshold_literal(expected)
+                if threshold is None:
+                    excluded.add(entity_id)
+                    continue
+                thresholds.setdefault(entity_id, {}).setdefault(attr_name, set()).add(threshold)
+        enforce = policy.get("enforce", {})
+        if isinstance(enforce, dict):
+            for entity_id in _extract_target_entities(enforce.get("target")):
+                parts = str(entity_id).split(".")
+                if len(parts) >= 2:
+                    excluded.add(parts[0] + "." + parts[1])
+    return {
+        entity_id: {attr_name: sorted(values) for attr_name, values in fields.items()}
+        for entity_id, fields in thresholds.items()
+        if entity_id not in excluded
+    }
+
+def _numeric_value(state: Optional[State], attr_name: Optional[str]) -> Optional[float]:
+    value = _state_value(state, attr_name)
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return number
+
+def threshold_crossed(fields: Dict[Optional[str], List[float]], old_state: Optional[State], new_state: Optional[State]) -> bool:
+    for attr_name, thresholds in fields.items():
+        old_value = _numeric_value(old_state, attr_name)
+        new_value = _numeric_value(new_state, attr_name)
+        if old_value is None or new_value is None:
+            return True
+        if old_value == new_value:
+            continue
+        if bisect.bisect_left(thresholds, old_value) != bisect.bisect_left(thresholds, new_value):
+            return True
+        if bisect.bisect_right(thresholds, old_value) != bisect.bisect_right(thresholds, new_value):
+            return True
+    return False
+
 def _load_yaml(path: str) -> Dict[str, Any]:
     import yaml
     with open(path, "r", encoding="utf-8") as f:
@@ -0,0 +1,289 @@
+import bisect
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from homeassistant.core import HomeAssistant, State
+from .const import DOMAIN
+from .policy_engine import _match_value, _split_entity_path, _state_value, threshold_crossed
+
+_LOGGER = logging.getLogger(__name__)
+_MISSING = object()
+
+# Incremental matcher over a priority-sorted policy snapshot: each distinct `when`
+# condition is a predicate with a cached truth value, each policy counts its true
+# predicates, and satisfied policy indices are kept sorted (= priority order).
+class PolicyNetwork:
+    def __init__(self, policies: Sequence[Dict[str, Any]], entity_index: Optional[Dict[str, Set[str]]] = None) -> None:
+        self._policies: Tuple[Dict[str, Any], ...] = tuple(policies)
+        self._names: List[str] = [str(p.get("name", "")) for p in self._policies]
+        self._predicates: List[Tuple[Any, Any]] = []
+        self._predicate_policies: List[List[int]] = []
+        self._fields: Dict[str, Dict[Optional[str], List[int]]] = {}
+        self._required: List[int] = []
+        self._policy_predicates: List[List[int]] = []
+        shared: Dict[Tuple[Any, type, Any], int] = {}
+        for index, policy in enumerate(self._policies):
+            when = policy.get("when", {})
+            self._policy_predicates.append([])
+            if not isinstance(when, dict):
+                # Never matches, same as evaluate(): one predicate that can never become true.
+                self._required.append(1)
+                continue
+            self._required.append(len(when))
+            for entity_path, expected in when.items():
+                key = (entity_path, type(expected), expected)
+                try:
+                    pid = shared.get(key)
+                except TypeError:
+                    pid = None
+                    key = None
+                if pid is None:
+                    pid = self._add_predicate(entity_path, expected)
+                    if key is not None:
+                        shared[key] = pid
+                self._predicate_policies[pid].append(index)
+                self._policy_predicates[index].append(pid)
+        self._truth: List[bool] = [False] * len(self._predicates)
+        self._field_values: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._satisfied_count: List[int] = [0] * len(self._policies)
+        self._satisfied: List[int] = []
+        for index, required in enumerate(self._required):
+            if required == 0:
+                self._satisfied.append(index)
+        self._all: Tuple[int, ...] = tuple(range(len(self._policies)))
+        self._all_positions: Dict[int, int] = {index: index for index in self._all}
+        self._candidates: Dict[str, Tuple[int, ...]] = {}
+        self._candidate_positions: Dict[str, Dict[int, int]] = {}
+        if entity_index:
+            positions: Dict[str, List[int]] = {}
+            for index, name in enumerate(self._names):
+                positions.setdefault(name, []).append(index)
+            for entity_id, names in entity_index.items():
+                indices: List[int] = []
+                for name in names:
+                    indices.extend(positions.get(name, []))
+                candidates = tuple(sorted(indices))
+                self._candidates[entity_id] = candidates
+                self._candidate_positions[entity_id] = {index: position for position, index in enumerate(candidates)}
+
+    def _add_predicate(self, entity_path: Any, expected: Any) -> int:
+        pid = len(self._predicates)
+        self._predicates.append((entity_path, expected))
+        self._predicate_policies.append([])
+        split = _split_entity_path(entity_path) if isinstance(entity_path, str) else None
+        if split is not None:
+            entity_id, attr_name = split
+            self._fields.setdefault(entity_id, {}).setdefault(attr_name, []).append(pid)
+        return pid
+
+    @property
+    def policies(self) -> Tuple[Dict[str, Any], ...]:
+        return self._policies
+
+    @property
+    def names(self) -> List[str]:
+        return self._names
+
+    @property
+    def policy_count(self) -> int:
+        return len(self._policies)
+
+    @property
+    def predicate_count(self) -> int:
+        return len(self._predicates)
+
+    def sync(self, hass: HomeAssistant) -> None:
+        self._field_values.clear()
+        for entity_id in self._fields:
+            self.update(entity_id, hass.states.get(entity_id))
+
+    def update(self, entity_id: str, new_state: Optional[State]) -> int:
+        fields = self._fields.get(entity_id)
+        if not fields:
+            return 0
+        checked = 0
+        for attr_name, pids in fields.items():
+            value = _state_value(new_state, attr_name)
+            field_key = (entity_id, attr_name)
+            previous = self._field_values.get(field_key, _MISSING)
+            if type(previous) is type(value) and previous == value:
+                continue
+            self._field_values[field_key] = value
+            for pid in pids:
+                checked += 1
+                truth = _match_value(value, self._predicates[pid][1])
+                if truth != self._truth[pid]:
+                    self._truth[pid] = truth
+                    self._propagate(pid, 1 if truth else -1)
+        return checked
+
+    def _propagate(self, pid: int, delta: int) -> None:
+        for index in self._predicate_policies[pid]:
+            required = self._required[index]
+            was_satisfied = self._satisfied_count[index] == required
+            self._satisfied_count[index] += delta
+            is_satisfied = self._satisfied_count[index] == required
+            if is_satisfied and not was_satisfied:
+                bisect.insort(self._satisfied, index)
+            elif was_satisfied and not is_satisfied:
+                pos = bisect.bisect_left(self._satisfied, index)
+                if pos < len(self._satisfied) and self._satisfied[pos] == index:
+                    del self._satisfied[pos]
+
+    def match(self, entity_id: Optional[str] = None) -> Tuple[Optional[int], Tuple[int, ...], int]:
+        # Returns (winner position, candidate policy indices, matched bitset over positions).
+        # Only the satisfied set is walked, in priority order, so the first satisfied policy
+        # that is a candidate for this entity is the winner.
+        if entity_id is None:
+            candidates, positions = self._all, self._all_positions
+        else:
+            candidates = self._candidates.get(entity_id, ())
+            positions = self._candidate_positions.get(entity_id, {})
+        winner = None
+        matched = 0
+        for index in self._satisfied:
+            position = positions.get(index)
+            if position is None:
+                continue
+            matched |= 1 << position
+            if winner is None:
+                winner = position
+        return winner, candidates, matched
+
+    def live_values(self, hass: HomeAssistant) -> Dict[Tuple[str, Optional[str]], Any]:
+        return {
+            (entity_id, attr_name): _state_value(hass.states.get(entity_id), attr_name)
+            for entity_id, fields in self._fields.items()
+            for attr_name in fields
+        }
+
+    def simulate(self, snapshots: Sequence[Dict[str, Any]], live_values: Optional[Dict[Tuple[str, Optional[str]], Any]] = None) -> List[Dict[str, Any]]:
+        # Column-wise evaluation: every predicate is checked once per distinct value and its
+        # truth across the whole batch is packed into an int bitmask (bit i = snapshot i).
+        # Only compiled, never-mutated structures are read, so this is safe in the executor.
+        live_values = live_values or {}
+        size = len(snapshots)
+        if not size:
+            return []
+        full = (1 << size) - 1
+        masks: List[int] = [0] * len(self._predicates)
+        for entity_id, fields in self._fields.items():
+            for attr_name, pids in fields.items():
+                live = live_values.get((entity_id, attr_name))
+                column = [_snapshot_value(snapshot, entity_id, attr_name, live) for snapshot in snapshots]
+                for pid in pids:
+                    masks[pid] = _column_mask(column, self._predicates[pid][1])
+        results: List[Dict[str, Any]] = [{"winner": None, "matches": []} for _ in range(size)]
+        undecided = full
+        for index, pids in enumerate(self._policy_predicates):
+            if len(pids) != self._required[index]:
+                continue
+            mask = full
+            for pid in pids:
+                mask &= masks[pid]
+                if not mask:
+                    break
+            if not mask:
+                continue
+            name = self._names[index]
+            for position in _bit_positions(mask):
+                results[position]["matches"].append(name)
+            winners = mask & undecided
+            if winners:
+                for position in _bit_positions(winners):
+                    results[position]["winner"] = name
+                undecided &= ~winners
+        return results
+
+# Decides whether a numeric tick may be skipped. Staying between the same two thresholds
+# only proves that this entity's conditions did not change; the winner among its candidates
+# can still change through other entities, so the tick is skipped only if the network gives
+# the same winner as the last evaluated tick and that winner is not waiting for a retry after
+# a cooldown skip or failed enforcement. The first tick per entity is never skipped.
+class ThresholdFilter:
+    def __init__(self, threshold_index: Dict[str, Dict[Optional[str], List[float]]], entity_index: Dict[str, Set[str]]) -> None:
+        self._index = threshold_index
+        self._entity_index = entity_index
+        self._last_winner: Dict[str, Optional[int]] = {}
+        self._pending: Set[str] = set()
+
+    def tracks(self, entity_id: Optional[str]) -> bool:
+        return entity_id in self._index
+
+    def should_skip(self, entity_id: str, winner_index: Optional[int], old_state: Optional[State], new_state: Optional[State]) -> bool:
+        fields = self._index.get(entity_id)
+        if not fields:
+            return False
+        previous = self._last_winner.get(entity_id, _MISSING)
+        self._last_winner[entity_id] = winner_index
+        if previous is _MISSING or previous != winner_index:
+            return False
+        if self._pending and not self._pending.isdisjoint(self._entity_index.get(entity_id, ())):
+            return False
+        return not threshold_crossed(fields, old_state, new_state)
+
+    def record(self, network: PolicyNetwork, candidates: Sequence[int], matched: int, winner_position: Optional[int], result: Optional[str]) -> None:
+        if self._pending:
+            for position, index in enumerate(candidates):
+                if not matched >> position & 1:
+                    self._pending.discard(network.names[index])
+        if winner_position is None:
+            return
+        name = network.names[candidates[winner_position]]
+        if result in ("skipped_cooldown", "error"):
+            self._pending.add(name)
+        else:
+            self._pending.discard(name)
+
+def _snapshot_value(snapshot: Dict[str, Any], entity_id: str, attr_name: Optional[str], default: Any) -> Any:
+    if entity_id not in snapshot:
+        return default
+    entry = snapshot[entity_id]
+    if entry is None:
+        return None
+    if isinstance(entry, dict):
+        if attr_name is None:
+            return entry.get("state", default)
+        attributes = entry.get("attributes")
+        if isinstance(attributes, dict) and attr_name in attributes:
+            return attributes[attr_name]
+        return default
+    if attr_name is None:
+        return entry
+    return default
+
+def _column_mask(column: List[Any], expected: Any) -> int:
+    cache: Dict[Tuple[type, Any], bool] = {}
+    bits: List[str] = []
+    for value in reversed(column):
+        try:
+            key = (type(value), value)
+            truth = cache.get(key)
+            if truth is None:
+                truth = cache[key] = _match_value(value, expected)
+        except TypeError:
+            truth = _match_value(value, expected)
+        bits.append("1" if truth else "0")
+    return int("".join(bits), 2)
+
+def _bit_positions(mask: int) -> List[int]:
+    bits = bin(mask)[:1:-1]
+    positions: List[int] = []
+    position = bits.find("1")
+    while position != -1:
+        positions.append(position)
+        position = bits.find("1", position + 1)
+    return positions
+
+async def async_simulate(hass: HomeAssistant, snapshots: Sequence[Dict[str, Any]], inherit_live: bool = True) -> List[Dict[str, Any]]:
+    network = hass.data.get(DOMAIN, {}).get("simulation_network")
+    if network is None:
+        return [{"winner": None, "matches": []} for _ in snapshots]
+    # Live values are read on the event loop; the batch itself runs in the executor.
+    live_values = network.live_values(hass) if inherit_live else None
+    return await hass.async_add_executor_job(network.simulate, list(snapshots), live_values)
+
+def build_policy_network(hass: HomeAssistant, policies: Sequence[Dict[str, Any]], entity_index: Optional[Dict[str, Set[str]]] = None) -> PolicyNetwork:
+    network = PolicyNetwork(policies, entity_index)
+    network.sync(hass)
+    _LOGGER.debug(f"[ha_governance] Policy network compiled: {network.policy_count} policies, {network.predicate_count} predicates")
+    return network
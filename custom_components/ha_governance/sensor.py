@@ -2,7 +2,7 @@ from homeassistant.components.sensor import SensorEntity
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from .const import DOMAIN, DISPATCHER_POLICY_EXECUTED, DISPATCHER_DECISION_UPDATED
+from .const import DOMAIN, DISPATCHER_POLICY_EXECUTED, DISPATCHER_DECISION_UPDATED, DISPATCHER_THRESHOLD_STATS_UPDATED
 
 
 class PolicyCountSensor(SensorEntity):
@@ -105,19 +105,28 @@ class LastDecisionSensor(SensorEntity):
         decision = data.get("last_decision")
         if not decision:
             return None
-        return decision.get("final_policy")
+        return decision.final_policy
 
     @property
     def extra_state_attributes(self):
         data = self._hass.data.get(DOMAIN, {})
-        decision = data.get("last_decision") or {}
+        decision = data.get("last_decision")
+        if decision is None:
+            return {
+                "timestamp": None,
+                "event_type": None,
+                "entity_id": None,
+                "policy_snapshot_hash": None,
+                "enforcement_result": None,
+                "context_id": None,
+            }
         return {
-            "timestamp": decision.get("timestamp"),
-            "event_type": decision.get("event_type"),
-            "entity_id": decision.get("entity_id"),
-            "policy_snapshot_hash": decision.get("policy_snapshot_hash"),
-            "enforcement_result": decision.get("enforcement_result"),
-            "context_id": decision.get("context_id"),
+            "timestamp": decision.iso_timestamp,
+            "event_type": decision.event_type,
+            "entity_id": decision.entity_id,
+            "policy_snapshot_hash": decision.policy_snapshot_hash,
+            "enforcement_result": decision.enforcement_result,
+            "context_id": decision.context_id,
         }
 
     @property
@@ -142,12 +151,64 @@ class LastDecisionSensor(SensorEntity):
             self._unsub = None
 
 
+class ThresholdSkipSensor(SensorEntity):
+    _attr_name = "HA Governance Threshold Skip Rate"
+    _attr_unique_id = "ha_governance_threshold_skip_rate"
+    _attr_icon = "mdi:filter-outline"
+    _attr_native_unit_of_measurement = "%"
+    # Counters change on every numeric tick; writing state per tick would add a state_changed
+    # event and a recorder row each time, so the sensor is polled and only pushed on reload.
+    _attr_should_poll = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._unsub = None
+
+    @property
+    def native_value(self):
+        data = self._hass.data.get(DOMAIN, {})
+        stats = data.get("threshold_stats", {})
+        skipped = sum(entry["skipped"] for entry in stats.values())
+        total = skipped + sum(entry["evaluated"] for entry in stats.values())
+        if not total:
+            return None
+        return round(100.0 * skipped / total, 1)
+
+    @property
+    def extra_state_attributes(self):
+        data = self._hass.data.get(DOMAIN, {})
+        stats = data.get("threshold_stats", {})
+        return {entity_id: dict(entry) for entity_id, entry in stats.items()}
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, "ha_governance")},
+            name="HA Governance",
+            manufacturer="Starsurfer78",
+            model="Governance Engine",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        self._unsub = async_dispatcher_connect(
+            self._hass,
+            DISPATCHER_THRESHOLD_STATS_UPDATED,
+            self.async_write_ha_state,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities) -> None:
     async_add_entities(
         [
             PolicyCountSensor(hass),
             PolicyStatsSensor(hass),
             LastDecisionSensor(hass),
+            ThresholdSkipSensor(hass),
         ],
         True,
     )
@@ -0,0 +1,30 @@
+import os
+import sys
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+try:
+    import homeassistant  # noqa: F401
+except ImportError:
+    # The engine modules only need State/HomeAssistant from homeassistant.core. Without a
+    # Home Assistant install, provide those and load the package without its __init__
+    # (which wires up config entries, services and the event bus).
+    class State:
+        def __init__(self, entity_id, state, attributes=None):
+            self.entity_id = entity_id
+            self.state = state
+            self.attributes = dict(attributes or {})
+
+    class HomeAssistant:
+        pass
+
+    core = types.ModuleType("homeassistant.core")
+    core.State = State
+    core.HomeAssistant = HomeAssistant
+    sys.modules["homeassistant"] = types.ModuleType("homeassistant")
+    sys.modules["homeassistant.core"] = core
+    package = types.ModuleType("custom_components.ha_governance")
+    package.__path__ = [os.path.join(ROOT, "custom_components", "ha_governance")]
+    sys.modules["custom_components.ha_governance"] = package
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from homeassistant.core import State
+
+from custom_components.ha_governance.policy_engine import _sort_policies, build_entity_index, evaluate
+from custom_components.ha_governance.policy_network import PolicyNetwork
+
+ENTITIES = [f"sensor.s{i}" for i in range(6)] + ["input_boolean.a", "input_select.house_mode"]
+VALUES = ["on", "off", "home", "away", "1", "5", "22.5", "abc", None]
+ATTRIBUTE_VALUES = [1, True, "5", "on", None, 22.5]
+
+
+class _States(dict):
+    def get(self, entity_id):
+        return dict.get(self, entity_id)
+
+
+class _Hass:
+    def __init__(self) -> None:
+        self.states = _States()
+
+
+def _random_expected(rng):
+    if rng.random() < 0.5:
+        return rng.choice([">=", ">", "<", "<=", "==", "!="]) + rng.choice(["1", "5", "10", "22", "on", "x"])
+    return rng.choice(["on", "off", "home", "5", 5, 1.0, True])
+
+
+def _random_policies(rng):
+    policies = []
+    for i in range(rng.randint(1, 15)):
+        when = {}
+        for _ in range(rng.randint(0, 4)):
+            path = rng.choice(ENTITIES)
+            if rng.random() < 0.3:
+                path += ".attr"
+            when[path] = _random_expected(rng)
+        if rng.random() < 0.03:
+            when = "invalid"
+        policies.append(
+            {
+                "name": f"p{i % 12}",
+                "priority": rng.randint(0, 5),
+                "when": when,
+                "enforce": {"target": {"entity_id": rng.choice(ENTITIES)}},
+            }
+        )
+    return _sort_policies(policies)
+
+
+def _random_state(rng, entity_id):
+    value = rng.choice(VALUES)
+    if value is None:
+        return None
+    return State(entity_id, value, {"attr": rng.choice(ATTRIBUTE_VALUES)})
+
+
+def _set_state(hass, entity_id, state):
+    if state is None:
+        hass.states.pop(entity_id, None)
+    else:
+        hass.states[entity_id] = state
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_match_equals_evaluate(seed):
+    rng = random.Random(seed)
+    policies = _random_policies(rng)
+    index = build_entity_index(policies)
+    hass = _Hass()
+    for entity_id in ENTITIES:
+        _set_state(hass, entity_id, _random_state(rng, entity_id))
+    network = PolicyNetwork(policies, index)
+    network.sync(hass)
+    for _ in range(30):
+        entity_id = rng.choice(ENTITIES)
+        state = _random_state(rng, entity_id)
+        _set_state(hass, entity_id, state)
+        network.update(entity_id, state)
+        for changed in (entity_id, None):
+            if changed is None:
+                selected = list(policies)
+            else:
+                names = index.get(changed, set())
+                selected = [p for p in policies if p.get("name") in names]
+            expected_winner, expected_evaluations = evaluate(hass, selected)
+            winner, candidates, matched = network.match(changed)
+            assert [policies[i] for i in candidates] == selected
+            actual_winner = policies[candidates[winner]] if winner is not None else None
+            assert actual_winner is expected_winner
+            assert [bool(matched >> position & 1) for position in range(len(candidates))] == [
+                e["matched"] for e in expected_evaluations
+            ]
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from homeassistant.core import State
+
+from custom_components.ha_governance.policy_engine import _sort_policies, evaluate
+from custom_components.ha_governance.policy_network import PolicyNetwork
+
+ENTITIES = [f"sensor.s{i}" for i in range(6)] + ["input_boolean.a", "input_select.house_mode"]
+VALUES = ["on", "off", "home", "away", "1", "5", "22.5", "abc"]
+
+
+class _States(dict):
+    def get(self, entity_id):
+        return dict.get(self, entity_id)
+
+
+class _Hass:
+    def __init__(self) -> None:
+        self.states = _States()
+
+
+def _random_policies(rng, count):
+    policies = []
+    for i in range(count):
+        when = {}
+        for _ in range(rng.randint(0, 4)):
+            path = rng.choice(ENTITIES) + (".attr" if rng.random() < 0.3 else "")
+            if rng.random() < 0.5:
+                when[path] = rng.choice([">=", ">", "<", "<=", "==", "!="]) + rng.choice(["1", "5", "10", "22", "on"])
+            else:
+                when[path] = rng.choice(["on", "off", "home", "5", 5, True])
+        policies.append({"name": f"p{i}", "priority": rng.randint(0, 5), "when": when})
+    return _sort_policies(policies)
+
+
+def _random_snapshot(rng):
+    snapshot = {}
+    for entity_id in ENTITIES:
+        roll = rng.random()
+        if roll < 0.3:
+            snapshot[entity_id] = rng.choice(VALUES)
+        elif roll < 0.4:
+            snapshot[entity_id] = None
+        elif roll < 0.6:
+            snapshot[entity_id] = {"state": rng.choice(VALUES), "attributes": {"attr": rng.choice([1, True, "on"])}}
+    return snapshot
+
+
+def _apply_snapshot(live, snapshot, inherit):
+    hass = _Hass()
+    for entity_id in ENTITIES:
+        base = live.states.get(entity_id) if inherit else None
+        if entity_id not in snapshot:
+            if base is not None:
+                hass.states[entity_id] = base
+            continue
+        entry = snapshot[entity_id]
+        if entry is None:
+            continue
+        attributes = dict(base.attributes) if base is not None else {}
+        if isinstance(entry, dict):
+            attributes.update(entry.get("attributes", {}))
+            value = entry.get("state", base.state if base is not None else None)
+            if value is None:
+                continue
+        else:
+            value = entry
+        hass.states[entity_id] = State(entity_id, value, attributes)
+    return hass
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_simulate_equals_evaluate(seed):
+    rng = random.Random(seed)
+    policies = _random_policies(rng, rng.randint(1, 15))
+    live = _Hass()
+    for entity_id in ENTITIES:
+        if rng.random() < 0.8:
+            live.states[entity_id] = State(entity_id, rng.choice(VALUES), {"attr": rng.choice([1, "5", "on"])})
+    network = PolicyNetwork(policies)
+    inherit = rng.random() < 0.5
+    snapshots = [_random_snapshot(rng) for _ in range(30)]
+    results = network.simulate(snapshots, network.live_values(live) if inherit else None)
+    for snapshot, result in zip(snapshots, results):
+        winner, evaluations = evaluate(_apply_snapshot(live, snapshot, inherit), policies)
+        assert result["winner"] == (winner["name"] if winner else None)
+        assert result["matches"] == [e["name"] for e in evaluations if e["matched"]]
+
@@ -0,0 +1,90 @@
+from homeassistant.core import State
+
+from custom_components.ha_governance.policy_engine import _sort_policies, build_entity_index, build_threshold_index
+from custom_components.ha_governance.policy_network import PolicyNetwork, ThresholdFilter
+
+POLICIES = _sort_policies(
+    [
+        {
+            "name": "away_heating_off",
+            "priority": 10,
+            "when": {"input_select.house_mode": "away", "sensor.temp": ">=18"},
+            "enforce": {"service": "climate.turn_off", "target": {"entity_id": "climate.x"}},
+        },
+        {
+            "name": "heating_eco",
+            "priority": 5,
+            "when": {"sensor.temp": ">=18"},
+            "enforce": {"service": "climate.eco", "target": {"entity_id": "climate.x"}},
+        },
+    ]
+)
+
+
+class _Setup:
+    def __init__(self) -> None:
+        self.states = {}
+        entity_index = build_entity_index(POLICIES)
+        self.network = PolicyNetwork(POLICIES, entity_index)
+        self.filter = ThresholdFilter(build_threshold_index(POLICIES), entity_index)
+
+    def set(self, entity_id, value):
+        old_state = self.states.get(entity_id)
+        new_state = State(entity_id, value)
+        self.states[entity_id] = new_state
+        self.network.update(entity_id, new_state)
+        return old_state, new_state
+
+    def tick(self, entity_id, value, result="success"):
+        # Mirrors _handle_event: returns the winning policy name, or None when the tick is skipped.
+        old_state, new_state = self.set(entity_id, value)
+        winner_position, candidates, matched = self.network.match(entity_id)
+        winner_index = candidates[winner_position] if winner_position is not None else None
+        if self.filter.should_skip(entity_id, winner_index, old_state, new_state):
+            return None
+        self.filter.record(self.network, candidates, matched, winner_position, result if winner_position is not None else None)
+        return self.network.names[winner_index] if winner_index is not None else "no winner"
+
+
+def test_only_temperature_is_threshold_filtered():
+    setup = _Setup()
+    assert setup.filter.tracks("sensor.temp")
+    assert not setup.filter.tracks("input_select.house_mode")
+    assert not setup.filter.tracks("climate.x")
+
+
+def test_first_tick_is_never_skipped():
+    setup = _Setup()
+    setup.set("input_select.house_mode", "away")
+    setup.set("sensor.temp", "20")
+    assert setup.tick("sensor.temp", "21") == "away_heating_off"
+    assert setup.tick("sensor.temp", "21.5") is None
+
+
+def test_winner_change_through_other_entity_is_not_skipped():
+    setup = _Setup()
+    setup.set("input_select.house_mode", "away")
+    setup.set("sensor.temp", "20")
+    assert setup.tick("sensor.temp", "21") == "away_heating_off"
+    setup.set("input_select.house_mode", "home")
+    assert setup.tick("sensor.temp", "22") == "heating_eco"
+    assert setup.tick("sensor.temp", "22.5") is None
+
+
+def test_threshold_crossing_is_not_skipped():
+    setup = _Setup()
+    setup.set("input_select.house_mode", "home")
+    setup.set("sensor.temp", "20")
+    assert setup.tick("sensor.temp", "21") == "heating_eco"
+    assert setup.tick("sensor.temp", "17") == "no winner"
+    assert setup.tick("sensor.temp", "16") is None
+
+
+def test_cooldown_blocked_winner_is_retried():
+    setup = _Setup()
+    setup.set("input_select.house_mode", "home")
+    setup.set("sensor.temp", "20")
+    assert setup.tick("sensor.temp", "21", result="skipped_cooldown") == "heating_eco"
+    assert setup.tick("sensor.temp", "21.5", result="error") == "heating_eco"
+    assert setup.tick("sensor.temp", "22") == "heating_eco"
+    assert setup.tick("sensor.temp", "22.5") is None